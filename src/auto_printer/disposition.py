@@ -0,0 +1,213 @@
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.auto_printer.logger import logger
+from src.auto_printer.settings import WatcherSettings
+
+DISPOSITION_MODES = ("delete", "archive", "keep")
+
+
+class DispositionJob:
+    """A printed (or failed) file waiting to be deleted or moved."""
+
+    def __init__(
+            self,
+            file_path: str,
+            error: Optional[BaseException],
+            timings: Dict[str, float],
+            submitted_at: datetime
+    ):
+        self.file_path = file_path
+        self.error = error
+        self.timings = timings
+        self.submitted_at = submitted_at
+
+
+class PostPrintDisposition:
+    """
+    Deletes or moves files after printing, off the printing thread.
+
+    Successful jobs are deleted, moved to a dated archive tree
+    (<archive_dir>/YYYY/MM/DD) or kept, depending on the mode. Failed
+    jobs are moved to the error folder together with a sidecar JSON
+    file holding the error and timings. Relative archive and error
+    folders are resolved against the watch folder. Jobs are handled in batches by
+    a background thread, so the next print never waits on file moves.
+    """
+
+    def __init__(self, settings: WatcherSettings, now: Callable[[], datetime] = datetime.now):
+        if settings.disposition_mode not in DISPOSITION_MODES:
+            raise ValueError(
+                f"Unknown disposition mode '{settings.disposition_mode}', "
+                f"expected one of {DISPOSITION_MODES}"
+            )
+
+        if settings.disposition_mode == "archive" and not settings.archive_dir:
+            raise ValueError("Disposition mode 'archive' requires archive_dir")
+
+        self.mode = settings.disposition_mode
+        # The archive only exists (and is excluded from printing) in archive mode
+        self.archive_dir = None
+        if self.mode == "archive":
+            self.archive_dir = self._resolve(settings.watch_path, settings.archive_dir)
+        self.error_dir = self._resolve(settings.watch_path, settings.error_dir) if settings.error_dir else None
+        self.batch_size = settings.disposition_batch_size
+        self.batch_interval = settings.disposition_batch_interval
+        self.now = now
+
+        self.jobs: "queue.Queue[Optional[DispositionJob]]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _resolve(watch_path: str, directory: str) -> str:
+        """Return directory as an absolute path, relative paths being inside the watch folder."""
+        return os.path.abspath(os.path.join(watch_path, directory))
+
+    def start(self):
+        """Start the background worker."""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name="disposition", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Process all pending jobs and stop the background worker."""
+        if self.thread is None:
+            return
+        self.jobs.put(None)
+        self.thread.join()
+        self.thread = None
+
+    def submit(self, file_path: str, error: Optional[BaseException] = None, timings: Optional[Dict[str, float]] = None):
+        """
+        Queue a file for disposition. Returns immediately.
+
+        Args:
+            file_path: Path of the file that was printed
+            error: Exception raised while printing, None on success
+            timings: Job timings (seconds) written to the error sidecar
+        """
+        self.jobs.put(DispositionJob(file_path, error, timings or {}, self.now()))
+
+    def is_managed_path(self, file_path: str) -> bool:
+        """Return True if the path is inside the archive or error folder."""
+        # Windows paths are case-insensitive
+        abs_path = os.path.normcase(os.path.abspath(file_path))
+        for directory in (self.archive_dir, self.error_dir):
+            if not directory:
+                continue
+            directory = os.path.normcase(directory)
+            try:
+                if os.path.commonpath([abs_path, directory]) == directory:
+                    return True
+            except ValueError:
+                continue  # Paths on different drives
+        return False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            job = self.jobs.get()
+            if job is None:
+                break
+
+            # Collect more jobs for a short while to move them together
+            batch = [job]
+            deadline = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self.jobs.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+
+            self._process_batch(batch)
+
+        # Drain whatever was queued behind the stop marker
+        leftover = []
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                leftover.append(job)
+        if leftover:
+            self._process_batch(leftover)
+
+    def _process_batch(self, batch: List[DispositionJob]):
+        logger.debug(f"Disposing {len(batch)} file(s)")
+        created_dirs = set()
+        for job in batch:
+            try:
+                if job.error is None:
+                    self._dispose_success(job, created_dirs)
+                else:
+                    self._dispose_failure(job, created_dirs)
+            except Exception as e:
+                logger.error(f"Failed to dispose {job.file_path}: {e}")
+
+    @staticmethod
+    def _ensure_dir(directory: str, created_dirs: set):
+        if directory not in created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            created_dirs.add(directory)
+
+    @staticmethod
+    def _unique_target(directory: str, file_name: str) -> str:
+        """Return a path in directory that does not overwrite an existing file."""
+        target = os.path.join(directory, file_name)
+        stem, suffix = os.path.splitext(file_name)
+        counter = 1
+        while os.path.exists(target):
+            target = os.path.join(directory, f"{stem}_{counter}{suffix}")
+            counter += 1
+        return target
+
+    def _move(self, file_path: str, directory: str, created_dirs: set) -> str:
+        self._ensure_dir(directory, created_dirs)
+        target = self._unique_target(directory, os.path.basename(file_path))
+        shutil.move(file_path, target)
+        return target
+
+    def _dispose_success(self, job: DispositionJob, created_dirs: set):
+        if not os.path.exists(job.file_path):
+            return
+
+        if self.mode == "delete":
+            os.remove(job.file_path)
+            logger.debug(f"🗑 Deleted {job.file_path}")
+        elif self.mode == "archive":
+            directory = os.path.join(self.archive_dir, job.submitted_at.strftime("%Y/%m/%d"))
+            target = self._move(job.file_path, directory, created_dirs)
+            logger.debug(f"📦 Archived {job.file_path} → {target}")
+
+    def _dispose_failure(self, job: DispositionJob, created_dirs: set):
+        if self.error_dir is None or not os.path.exists(job.file_path):
+            return
+
+        target = self._move(job.file_path, self.error_dir, created_dirs)
+        sidecar = {
+            "file": job.file_path,
+            "moved_to": target,
+            "error": str(job.error),
+            "error_type": type(job.error).__name__,
+            "timings": job.timings,
+            "failed_at": job.submitted_at.isoformat(),
+            "disposed_at": self.now().isoformat(),
+        }
+        Path(target + ".json").write_text(json.dumps(sidecar, indent=2), encoding="utf-8")
+        logger.warning(f"Moved failed job {job.file_path} → {target}")
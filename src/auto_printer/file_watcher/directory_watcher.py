@@ -5,7 +5,10 @@ Installation:
     pip install watchdog pydantic-settings
 """
 
+import threading
 import time
+from typing import Optional
+
 from watchdog.observers import Observer
 import os
 
@@ -16,9 +19,15 @@ from src.auto_printer.logger import logger
 
 class DirectoryWatcher:
 
-    def __init__(self, settings: WatcherSettings, handler: DirectoryWatcherEventHandler):
+    def __init__(
+            self,
+            settings: WatcherSettings,
+            handler: DirectoryWatcherEventHandler,
+            stop_event: Optional[threading.Event] = None
+    ):
         self.path = settings.watch_path
         self.handler = handler
+        self.stop_event = stop_event  # Set on shutdown to release jobs waiting in the handler
         self.sleep_time = settings.sleep_interval
 
     def watch_directory(self):
@@ -47,6 +56,8 @@ class DirectoryWatcher:
             while True:
                 time.sleep(self.sleep_time)
         except KeyboardInterrupt:
+            if self.stop_event is not None:
+                self.stop_event.set()
             observer.stop()
             logger.warning("\n\nStopped watching directory")
 
@@ -2,16 +2,20 @@ import os
 import time
 from watchdog.events import FileSystemEventHandler
 
+from src.auto_printer.disposition import PostPrintDisposition
 from src.auto_printer.logger import logger
+from src.auto_printer.spooler import PrintCancelled
 
 
 class DirectoryWatcherEventHandler(FileSystemEventHandler):
     """Handles file system events"""
 
-    def __init__(self, printer):
+    def __init__(self, printer, disposition: PostPrintDisposition):
         self.printer = printer
+        self.disposition = disposition  # Deletes/archives files off the printing thread
         self.processed_files = {}  # Track files and their last modification time
         self.debounce_seconds = 5  # Don't print the same file within 5 seconds
+        self.settle_seconds = 2  # Wait before printing a newly created file
 
     def _should_process(self, file_path):
         """Check if this file should be processed (not recently printed)."""
@@ -52,20 +56,43 @@ class DirectoryWatcherEventHandler(FileSystemEventHandler):
                 logger.debug(f"✓ Non-PDF file created (ignored): {event.src_path}")
                 return
 
+            if self.disposition.is_managed_path(event.src_path):
+                logger.debug(f"✓ Archived file created (ignored): {event.src_path}")
+                return
+
             logger.info(f"✓ File created: {event.src_path}")
 
             if not self._should_process(event.src_path):
                 return
 
+            detected_at = time.time()
+            print_started = None
             try:
-                time.sleep(2)
+                time.sleep(self.settle_seconds)
+                print_started = time.time()
                 self.printer.print_file(event.src_path)
-                time.sleep(2)
-                if os.path.exists(event.src_path):
-                    os.remove(event.src_path)
                 self.processed_files.clear()
+                error = None
+            except PrintCancelled as e:
+                # Never printed, so leave the file where it is for the next run
+                logger.warning(f"Not printed, leaving {event.src_path} in place: {e}")
+                return
             except Exception as e:
                 logger.error(f"Failed to print {event.src_path}: {e}")
+                error = e
+
+            finished_at = time.time()
+            timings = {
+                "detected_at": detected_at,
+                "print_started_at": print_started,
+                "finished_at": finished_at,
+                "total_seconds": finished_at - detected_at,
+            }
+            if print_started is not None:
+                timings["print_seconds"] = finished_at - print_started
+
+            # Deleting or archiving happens in the background
+            self.disposition.submit(event.src_path, error=error, timings=timings)
         else:
             logger.debug(f"✓ Directory created: {event.src_path}")
 
@@ -1,25 +1,44 @@
+import math
 import os
+import threading
 import time
+from typing import Optional, Tuple
 
 import pypdfium2 as pdfium
 import win32con
 import win32print
 import win32ui
-from PIL import ImageWin
+from PIL import Image, ImageWin
 
 from src.auto_printer.logger import logger
+from src.auto_printer.render_cache import RenderCache, hash_content
+from src.auto_printer.render_resolution import AdaptiveResolution, RenderStats
 from src.auto_printer.settings import WatcherSettings
+from src.auto_printer.spooler import SpoolerBackpressure, SpoolQueueStats
 
 
 class Printer:
 
-    def __init__(self, settings: WatcherSettings):
+    def __init__(self, settings: WatcherSettings, stop_event: Optional[threading.Event] = None):
         # Choose printer (default or by name)
         if settings.printer_name is None:
             self.printer = win32print.GetDefaultPrinter()
         else:
             self.printer = self._get_printer_by_name(settings.printer_name)
 
+        self.backpressure = SpoolerBackpressure(settings, self._get_spool_queue_stats, stop_event=stop_event)
+
+        self.render_cache: Optional[RenderCache] = None
+        if settings.render_cache_enabled:
+            self.render_cache = RenderCache(
+                settings.render_cache_max_bytes,
+                disk_dir=settings.render_cache_dir,
+                disk_max_bytes=settings.render_cache_disk_max_bytes,
+            )
+
+        self.resolution = AdaptiveResolution(settings)
+        self.pdf_retry_delay = 0.5  # Seconds between checks while a PDF is being written
+
     @staticmethod
     def _get_printer_by_name(printer_name: str) -> str:
         """Check if a printer exists by name and return it."""
@@ -56,7 +75,23 @@ class Printer:
             logger.warning(f"⚠️ Could not check printer status for '{printer_name}': {e}")
             return False
 
-    def _wait_for_pdf(self, file_path: str, max_retries: int = 20, retry_delay: float = 0.5) -> str:
+    @staticmethod
+    def _get_spool_queue_stats(printer_name: str) -> SpoolQueueStats:
+        """Return the number of queued jobs and spooled bytes for a printer."""
+        hprinter = win32print.OpenPrinter(printer_name)
+        try:
+            jobs = win32print.EnumJobs(hprinter, 0, -1, 2)
+            spooled_bytes = sum(job["Size"] for job in jobs)
+            return len(jobs), spooled_bytes
+        finally:
+            win32print.ClosePrinter(hprinter)
+
+    def _wait_for_pdf(
+            self,
+            file_path: str,
+            max_retries: int = 20,
+            retry_delay: float = 0.5
+    ) -> Tuple[str, Optional[str]]:
         """
         Wait for PDF file to be fully written and valid.
 
@@ -66,7 +101,8 @@ class Printer:
             retry_delay: Delay between retries in seconds
 
         Returns:
-            Absolute path to the file
+            Absolute path to the file and its content hash (None when the
+            render cache is disabled)
         """
         abs_path = os.path.abspath(file_path)
         last_size = -1
@@ -124,7 +160,9 @@ class Printer:
                     page_count = len(test_pdf)
                     test_pdf.close()
                     logger.info(f"✓ PDF validated: {page_count} page(s)")
-                    return abs_path
+                    # Hash the validated content now instead of reading the file again
+                    doc_hash = hash_content(data) if self.render_cache is not None else None
+                    return abs_path, doc_hash
                 except Exception as pdf_error:
                     logger.debug(f"PDF not valid yet: {pdf_error}")
                     time.sleep(retry_delay)
@@ -137,14 +175,71 @@ class Printer:
 
         raise RuntimeError(f"Timeout waiting for valid PDF file: {abs_path}")
 
-    def _print_pdf_direct(self, pdf_path: str, printer_name: str):
+    def _render_page(
+            self,
+            page,
+            page_num: int,
+            render_scale: float,
+            doc_hash: Optional[str]
+    ) -> Tuple[Image.Image, bool]:
+        """
+        Render a page to an RGB image, reusing a cached raster when possible.
+
+        Args:
+            page: pypdfium2 page to render
+            page_num: Index of the page in the document
+            render_scale: Scale factor relative to 72 DPI
+            doc_hash: Content hash of the document (None disables caching)
+
+        Returns:
+            RGB PIL image of the page, and whether it came from the cache
+        """
+        key = None
+        if self.render_cache is not None and doc_hash is not None:
+            # Same size computation pypdfium2 uses for the output bitmap
+            width = math.ceil(page.get_width() * render_scale)
+            height = math.ceil(page.get_height() * render_scale)
+            key = (doc_hash, page_num, width, height, 'RGB')
+
+            data = self.render_cache.get(key)
+            if data is not None:
+                logger.debug(f"Render cache hit for page {page_num + 1}")
+                return Image.frombytes('RGB', (width, height), data), True
+
+        # Render the page
+        bitmap = page.render(
+            scale=render_scale,
+            rotation=0,
+        )
+
+        try:
+            # Convert to PIL Image
+            pil_image = bitmap.to_pil()
+
+            # Convert to RGB if necessary
+            if pil_image.mode != 'RGB':
+                rgb_image = pil_image.convert('RGB')
+                pil_image.close()
+                pil_image = rgb_image
+        finally:
+            # The RGB image is a copy of the buffer, so the bitmap can be freed now
+            bitmap.close()
+
+        if key is not None and pil_image.size == key[2:4]:
+            self.render_cache.put(key, pil_image.tobytes())
+
+        return pil_image, False
+
+    def _print_pdf_direct(self, pdf_path: str, printer_name: str, doc_hash: Optional[str] = None):
         """
         Print PDF directly using pypdfium2 by converting pages to images.
 
         Args:
             pdf_path: Path to the PDF file
             printer_name: Name of the printer
+            doc_hash: Content hash of the PDF, used as render cache key (None disables caching)
         """
+        pdf = None
         try:
             # Open the PDF
             pdf = pdfium.PdfDocument(pdf_path)
@@ -175,6 +270,7 @@ class Printer:
 
                 # Start print job
                 hdc.StartDoc(os.path.basename(pdf_path))
+                stats = RenderStats()
 
                 # Process each page
                 for page_num in range(page_count):
@@ -185,55 +281,76 @@ class Printer:
                     # Render page to bitmap at printer resolution
                     page = pdf[page_num]
 
-                    # Use printer DPI for rendering
-                    render_scale = printer_dpi_x / 72  # 72 is PDF's default DPI
-
-                    # Render the page
-                    bitmap = page.render(
-                        scale=render_scale,
-                        rotation=0,
-                    )
-
-                    # Convert to PIL Image
-                    pil_image = bitmap.to_pil()
-
-                    # Convert to RGB if necessary
-                    if pil_image.mode != 'RGB':
-                        pil_image = pil_image.convert('RGB')
-
-                    # Get image dimensions
-                    img_width, img_height = pil_image.size
-
-                    # Calculate scaling to fit on page while maintaining aspect ratio
-                    scale_x = page_width / img_width
-                    scale_y = page_height / img_height
-                    scale = min(scale_x, scale_y)
-
-                    new_width = int(img_width * scale)
-                    new_height = int(img_height * scale)
-
-                    # Center image on page
-                    x_offset = (page_width - new_width) // 2
-                    y_offset = (page_height - new_height) // 2
-
-                    # Use PIL's ImageWin to draw directly to the device context
-                    dib = ImageWin.Dib(pil_image)
-                    dib.draw(hdc.GetHandleOutput(), (x_offset, y_offset, x_offset + new_width, y_offset + new_height))
+                    try:
+                        # Content analysis is timed too, like in render_benchmark
+                        render_started = time.perf_counter()
+
+                        # Use printer DPI for rendering, or less if the content doesn't need it
+                        render_dpi = self.resolution.choose_dpi(page, printer_dpi_x)
+                        render_scale = render_dpi / 72  # 72 is PDF's default DPI
+                        logger.debug(f"Rendering page {page_num + 1} at {render_dpi} DPI")
+
+                        pil_image, cached = self._render_page(page, page_num, render_scale, doc_hash)
+                        if cached:
+                            # A cache lookup says nothing about render speed or raster size
+                            stats.record_cached()
+                        else:
+                            stats.record(
+                                page.get_width(),
+                                page.get_height(),
+                                render_dpi,
+                                printer_dpi_x,
+                                time.perf_counter() - render_started,
+                            )
+                    finally:
+                        page.close()
+
+                    try:
+                        # Get image dimensions
+                        img_width, img_height = pil_image.size
+
+                        # Calculate scaling to fit on page while maintaining aspect ratio
+                        scale_x = page_width / img_width
+                        scale_y = page_height / img_height
+                        scale = min(scale_x, scale_y)
+
+                        new_width = int(img_width * scale)
+                        new_height = int(img_height * scale)
+
+                        # Center image on page
+                        x_offset = (page_width - new_width) // 2
+                        y_offset = (page_height - new_height) // 2
+
+                        # Use PIL's ImageWin to draw directly to the device context
+                        dib = ImageWin.Dib(pil_image)
+                        dib.draw(hdc.GetHandleOutput(), (x_offset, y_offset, x_offset + new_width, y_offset + new_height))
+                    finally:
+                        # Free page rasters now instead of waiting for GC
+                        pil_image.close()
 
                     hdc.EndPage()
 
                 # End print job
                 hdc.EndDoc()
 
+                if self.resolution.enabled:
+                    logger.info(f"Adaptive DPI: {stats.summary()}")
+
             finally:
                 hdc.DeleteDC()
 
-            pdf.close()
             logger.info(f"✓ Successfully printed {page_count} page(s)")
 
+            if self.render_cache is not None:
+                logger.info(f"Render cache: {self.render_cache.stats()}")
+
         except Exception as e:
             logger.error(f"Error printing PDF: {e}")
             raise
+        finally:
+            # Close the document even if rendering failed
+            if pdf is not None:
+                pdf.close()
 
     def print_file(self, file_path, printer_name=None):
         """
@@ -260,8 +377,12 @@ class Printer:
             raise ValueError(f"Only PDF files are supported. Got: {file_path}")
 
         # Wait for PDF to be fully written and valid
-        abs_file_path = self._wait_for_pdf(file_path)
+        # The content hash identifies reprints for the render cache
+        abs_file_path, doc_hash = self._wait_for_pdf(file_path, retry_delay=self.pdf_retry_delay)
+
+        # Keep the job as a PDF until the spool queue has room for it
+        self.backpressure.wait_for_capacity(target_printer)
 
         # Print the PDF
-        self._print_pdf_direct(abs_file_path, target_printer)
+        self._print_pdf_direct(abs_file_path, target_printer, doc_hash)
         logger.info(f"✓ Sent '{abs_file_path}' to printer: {target_printer} (A4 format)")
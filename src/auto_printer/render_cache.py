@@ -0,0 +1,179 @@
+import hashlib
+import os
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.auto_printer.logger import logger
+
+# (document content hash, page index, width, height, colour mode)
+RenderKey = Tuple[str, int, int, int, str]
+
+
+def hash_content(data: bytes) -> str:
+    """Return the SHA-256 hex digest of a document already read into memory."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_document(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's content (same as hash_content)."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    LRU cache of rendered page rasters with a byte budget.
+
+    Rasters are stored as raw pixel bytes; width, height and colour mode
+    are part of the key. Entries evicted from memory are optionally
+    spilled to a zlib-compressed on-disk store and promoted back on use.
+    """
+
+    def __init__(
+            self,
+            max_bytes: int,
+            disk_dir: Optional[str] = None,
+            disk_max_bytes: int = 0
+    ):
+        """
+        Args:
+            max_bytes: Memory budget for cached rasters
+            disk_dir: Directory for the on-disk store (None disables it)
+            disk_max_bytes: Budget for the on-disk store (0 means unlimited)
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self.entries: "OrderedDict[RenderKey, bytes]" = OrderedDict()
+        self.current_bytes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Spilled files in least recently used order, path -> size on disk
+        self.disk_entries: "OrderedDict[Path, int]" = OrderedDict()
+        self.disk_bytes = 0
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            # Pick up pages spilled by a previous run, oldest first
+            for path in sorted(self.disk_dir.glob("*.raw.z"), key=os.path.getmtime):
+                size = path.stat().st_size
+                self.disk_entries[path] = size
+                self.disk_bytes += size
+            self._trim_disk()
+
+    def _disk_path(self, key: RenderKey) -> Path:
+        name = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+        return self.disk_dir / f"{name}.raw.z"
+
+    def _spill(self, key: RenderKey, data: bytes):
+        """Write an evicted entry to the on-disk store."""
+        path = self._disk_path(key)
+        if path in self.disk_entries:
+            self.disk_entries.move_to_end(path)
+            return
+        compressed = zlib.compress(data, 1)
+        try:
+            path.write_bytes(compressed)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not spill rendered page to disk: {e}")
+            return
+        self.disk_entries[path] = len(compressed)
+        self.disk_bytes += len(compressed)
+        self._trim_disk()
+
+    def _trim_disk(self):
+        """Delete least recently used files until the on-disk store fits its budget."""
+        if self.disk_max_bytes <= 0:
+            return
+        while self.disk_bytes > self.disk_max_bytes and self.disk_entries:
+            path, size = self.disk_entries.popitem(last=False)
+            self.disk_bytes -= size
+            path.unlink(missing_ok=True)
+
+    def _load(self, key: RenderKey) -> Optional[bytes]:
+        """Read an entry from the on-disk store and mark it recently used."""
+        path = self._disk_path(key)
+        if path not in self.disk_entries:
+            return None
+        try:
+            data = zlib.decompress(path.read_bytes())
+            # Keep the mtime in step so a restart restores the same LRU order
+            os.utime(path)
+        except (OSError, zlib.error):
+            self.disk_bytes -= self.disk_entries.pop(path)
+            return None
+        self.disk_entries.move_to_end(path)
+        return data
+
+    def get(self, key: RenderKey) -> Optional[bytes]:
+        """
+        Look up a rendered page.
+
+        Args:
+            key: Render key of the page
+
+        Returns:
+            Raw pixel bytes, or None on a miss
+        """
+        data = self.entries.get(key)
+        if data is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+        if self.disk_dir is not None:
+            data = self._load(key)
+            if data is not None:
+                self.disk_hits += 1
+                self.put(key, data)
+                return data
+
+        self.misses += 1
+        return None
+
+    def put(self, key: RenderKey, data: bytes):
+        """
+        Store a rendered page, evicting least recently used entries.
+
+        Args:
+            key: Render key of the page
+            data: Raw pixel bytes
+        """
+        if len(data) > self.max_bytes:
+            # Never fits in memory, go straight to disk
+            if self.disk_dir is not None:
+                self._spill(key, data)
+            return
+
+        if key in self.entries:
+            self.current_bytes -= len(self.entries.pop(key))
+
+        self.entries[key] = data
+        self.current_bytes += len(data)
+
+        while self.current_bytes > self.max_bytes:
+            old_key, old_data = self.entries.popitem(last=False)
+            self.current_bytes -= len(old_data)
+            if self.disk_dir is not None:
+                self._spill(old_key, old_data)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and memory usage."""
+        lookups = self.hits + self.disk_hits + self.misses
+        hit_rate = (self.hits + self.disk_hits) / lookups if lookups else 0.0
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hit_rate,
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+        }
@@ -0,0 +1,218 @@
+import math
+from typing import Optional
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+from src.auto_printer.settings import WatcherSettings
+
+# Page objects drawn as vectors (crisp at any resolution)
+VECTOR_OBJECT_TYPES = (
+    pdfium_c.FPDF_PAGEOBJ_TEXT,
+    pdfium_c.FPDF_PAGEOBJ_PATH,
+    pdfium_c.FPDF_PAGEOBJ_SHADING,
+)
+
+# Forms nested deeper than this are not inspected; such pages render at printer DPI
+MAX_FORM_DEPTH = 8
+
+# Raster bytes per pixel of the RGB image sent to the spooler
+BYTES_PER_PIXEL = 3
+
+
+class PageContent:
+    """Summary of what a PDF page is made of."""
+
+    def __init__(
+            self,
+            has_vector: bool = False,
+            image_count: int = 0,
+            max_image_dpi: float = 0.0,
+            has_unresolved_forms: bool = False,
+            annotation_count: int = 0
+    ):
+        self.has_vector = has_vector
+        self.image_count = image_count
+        self.max_image_dpi = max_image_dpi  # Highest effective DPI of any embedded image
+        self.has_unresolved_forms = has_unresolved_forms  # Forms nested deeper than MAX_FORM_DEPTH
+        self.annotation_count = annotation_count  # Annotations are drawn by page.render() too
+
+
+def _image_dpi(image, page_matrix: pdfium.PdfMatrix) -> float:
+    """
+    Return the effective DPI of an image object as placed on the page.
+
+    Args:
+        image: Image page object
+        page_matrix: Image matrix combined with the matrices of all enclosing forms
+
+    Returns:
+        Highest of the horizontal and vertical DPI
+    """
+    width_px, height_px = image.get_size()
+    # An image fills the unit square; (a, b) and (c, d) are its edges in page space
+    width_pt = math.hypot(page_matrix.a, page_matrix.b)
+    height_pt = math.hypot(page_matrix.c, page_matrix.d)
+
+    dpi = 0.0
+    if width_pt > 0:
+        dpi = max(dpi, width_px * 72 / width_pt)
+    if height_pt > 0:
+        dpi = max(dpi, height_px * 72 / height_pt)
+    return dpi
+
+
+def _collect(page, content: PageContent, form=None, parent_matrix: Optional[pdfium.PdfMatrix] = None, depth: int = 0):
+    """Add the objects of a page (or of one form on it) to content."""
+    for obj in page.get_objects(max_depth=1, form=form, level=depth):
+        if obj.type in VECTOR_OBJECT_TYPES:
+            content.has_vector = True
+            continue
+        if obj.type not in (pdfium_c.FPDF_PAGEOBJ_IMAGE, pdfium_c.FPDF_PAGEOBJ_FORM):
+            continue
+
+        # Row-vector convention: the object's matrix applies before its parents'
+        matrix = obj.get_matrix()
+        if parent_matrix is not None:
+            matrix = matrix.multiply(parent_matrix)
+
+        if obj.type == pdfium_c.FPDF_PAGEOBJ_IMAGE:
+            content.image_count += 1
+            content.max_image_dpi = max(content.max_image_dpi, _image_dpi(obj, matrix))
+        elif depth + 1 >= MAX_FORM_DEPTH:
+            content.has_unresolved_forms = True
+        else:
+            _collect(page, content, form=obj, parent_matrix=matrix, depth=depth + 1)
+
+
+def analyze_page(page) -> PageContent:
+    """
+    Inspect the objects of a pypdfium2 page, including Form XObjects.
+
+    Image sizes are measured in page space, with the matrices of all
+    enclosing forms applied, so scaled, rotated and skewed images get
+    their real DPI. Annotations are rendered with the page but their
+    appearance streams are not page objects, so any annotation counts as
+    vector content.
+
+    Args:
+        page: pypdfium2 page to inspect
+
+    Returns:
+        PageContent describing text/vector and image objects on the page
+    """
+    content = PageContent()
+    _collect(page, content)
+
+    content.annotation_count = pdfium_c.FPDFPage_GetAnnotCount(page.raw)
+    if content.annotation_count > 0:
+        content.has_vector = True
+    return content
+
+
+class AdaptiveResolution:
+    """
+    Picks a render resolution per page from its content.
+
+    Vector content (text, paths, shadings, annotations) is rendered at
+    the configured vector DPI, images at their effective DPI. The result is clamped
+    between the configured floor and the printer DPI. Pages with forms
+    nested too deeply to inspect, and all pages when adaptive rendering
+    is disabled, are rendered at printer DPI.
+    """
+
+    def __init__(self, settings: WatcherSettings):
+        self.enabled = settings.adaptive_dpi_enabled
+        self.floor_dpi = settings.adaptive_dpi_floor
+        self.vector_dpi = settings.adaptive_dpi_vector
+
+    def choose_dpi(self, page, printer_dpi: int) -> int:
+        """
+        Return the DPI to render a page at.
+
+        Args:
+            page: pypdfium2 page to render
+            printer_dpi: Native resolution of the printer
+
+        Returns:
+            Render resolution between the floor and the printer DPI
+        """
+        if not self.enabled:
+            return printer_dpi
+
+        content = analyze_page(page)
+        if content.has_unresolved_forms:
+            # Unknown content, don't risk under-rendering it
+            return printer_dpi
+
+        dpi = content.max_image_dpi
+        if content.has_vector:
+            dpi = max(dpi, self.vector_dpi)
+
+        floor_dpi = min(self.floor_dpi, printer_dpi)
+        return int(round(min(max(dpi, floor_dpi), printer_dpi)))
+
+
+class RenderStats:
+    """
+    Render throughput and raster bytes compared with fixed printer DPI.
+
+    Pages served from the render cache are only counted, so they don't
+    inflate the throughput or savings of real renders.
+    """
+
+    def __init__(self):
+        self.pages = 0
+        self.cached_pages = 0
+        self.render_seconds = 0.0
+        self.raster_bytes = 0
+        self.fixed_raster_bytes = 0
+
+    @staticmethod
+    def raster_size(width_pt: float, height_pt: float, dpi: float) -> int:
+        """Return the RGB raster size in bytes of a page rendered at dpi."""
+        width_px = int(width_pt * dpi / 72 + 0.5)
+        height_px = int(height_pt * dpi / 72 + 0.5)
+        return width_px * height_px * BYTES_PER_PIXEL
+
+    def record(self, width_pt: float, height_pt: float, dpi: int, printer_dpi: int, seconds: float):
+        """
+        Add a rendered page.
+
+        Args:
+            width_pt: Page width in PDF points
+            height_pt: Page height in PDF points
+            dpi: Resolution the page was rendered at
+            printer_dpi: Resolution of the fixed-DPI baseline
+            seconds: Time spent rendering the page
+        """
+        self.pages += 1
+        self.render_seconds += seconds
+        self.raster_bytes += self.raster_size(width_pt, height_pt, dpi)
+        self.fixed_raster_bytes += self.raster_size(width_pt, height_pt, printer_dpi)
+
+    def record_cached(self):
+        """Add a page whose raster came from the render cache."""
+        self.cached_pages += 1
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.render_seconds if self.render_seconds else 0.0
+
+    @property
+    def saved_ratio(self) -> float:
+        """Fraction of raster bytes saved compared with fixed printer DPI."""
+        if not self.fixed_raster_bytes:
+            return 0.0
+        return 1 - self.raster_bytes / self.fixed_raster_bytes
+
+    def summary(self) -> str:
+        summary = (
+            f"{self.pages} page(s) at {self.pages_per_second:.2f} pages/s, "
+            f"raster {self.raster_bytes / 1024 / 1024:.1f} MB vs "
+            f"{self.fixed_raster_bytes / 1024 / 1024:.1f} MB at fixed DPI "
+            f"({self.saved_ratio:.0%} saved)"
+        )
+        if self.cached_pages:
+            summary += f", {self.cached_pages} page(s) from render cache"
+        return summary
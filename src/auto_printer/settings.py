@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,5 +9,31 @@ class WatcherSettings(BaseSettings):
     watch_path: str = "."  # directory to watch
     printer_name: str = ""
 
+    # Spooler backpressure (0 disables a high-water mark)
+    spool_high_water_jobs: int = 8  # hold jobs at this many queued jobs
+    spool_low_water_jobs: int = 2  # resume at this many queued jobs
+    spool_high_water_bytes: int = 512 * 1024 * 1024  # hold at this many spooled bytes
+    spool_low_water_bytes: int = 128 * 1024 * 1024  # resume at this many spooled bytes
+    spool_poll_interval: float = 1.0  # seconds between spool queue checks
+    spool_max_hold_seconds: float = 600.0  # send a held job anyway after this long (0 waits forever)
+
+    # Rendered-page cache for reprints and repeated pages
+    render_cache_enabled: bool = False
+    render_cache_max_bytes: int = 256 * 1024 * 1024  # in-memory LRU budget
+    render_cache_dir: Optional[str] = None  # spill evicted pages here (None disables)
+    render_cache_disk_max_bytes: int = 2 * 1024 * 1024 * 1024  # 0 means unlimited
+
+    # Post-print disposition
+    disposition_mode: str = "delete"  # delete | archive | keep
+    archive_dir: str = "archive"  # dated archive tree for printed files in archive mode (relative to watch_path)
+    error_dir: Optional[str] = None  # failed files and their JSON sidecars, relative to watch_path (None keeps them in place)
+    disposition_batch_size: int = 32  # max files handled per batch
+    disposition_batch_interval: float = 0.5  # seconds to collect a batch
+
+    # Content-aware render resolution per page
+    adaptive_dpi_enabled: bool = False
+    adaptive_dpi_floor: int = 150  # never render below this DPI
+    adaptive_dpi_vector: int = 300  # DPI for pages with text or vector graphics
+
     class Config:
         case_sensitive = False
\ No newline at end of file
@@ -0,0 +1,131 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from src.auto_printer.logger import logger
+from src.auto_printer.settings import WatcherSettings
+
+# (queued job count, spooled bytes) for a single printer queue
+SpoolQueueStats = Tuple[int, int]
+
+
+class PrintCancelled(Exception):
+    """Raised when a job is abandoned before printing because AutoPrinter is stopping."""
+
+
+class SpoolerBackpressure:
+    """
+    Holds print jobs back while a printer's spool queue is too full.
+
+    A printer is put on hold once its queued job count or spooled bytes
+    reach the high-water mark, and released only after both drop to the
+    low-water mark. While on hold, jobs wait in AutoPrinter as plain PDF
+    files instead of being expanded into raster data inside the spooler.
+
+    A hold is released early when the stop event is set (shutdown) or
+    after the maximum hold time, so a paused printer never blocks the
+    watcher forever.
+    """
+
+    def __init__(
+            self,
+            settings: WatcherSettings,
+            stats_provider: Callable[[str], SpoolQueueStats],
+            stop_event: Optional[threading.Event] = None,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        if settings.spool_low_water_jobs > settings.spool_high_water_jobs > 0:
+            raise ValueError(
+                f"spool_low_water_jobs ({settings.spool_low_water_jobs}) must not exceed "
+                f"spool_high_water_jobs ({settings.spool_high_water_jobs})"
+            )
+        if settings.spool_low_water_bytes > settings.spool_high_water_bytes > 0:
+            raise ValueError(
+                f"spool_low_water_bytes ({settings.spool_low_water_bytes}) must not exceed "
+                f"spool_high_water_bytes ({settings.spool_high_water_bytes})"
+            )
+
+        self.high_water_jobs = settings.spool_high_water_jobs
+        self.low_water_jobs = settings.spool_low_water_jobs
+        self.high_water_bytes = settings.spool_high_water_bytes
+        self.low_water_bytes = settings.spool_low_water_bytes
+        self.poll_interval = settings.spool_poll_interval
+        self.max_hold_seconds = settings.spool_max_hold_seconds
+        self.stats_provider = stats_provider
+        self.stop_event = stop_event or threading.Event()
+        self.clock = clock
+        self.held_printers: Dict[str, bool] = {}  # Printer name -> on hold
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if at least one high-water mark is configured."""
+        return self.high_water_jobs > 0 or self.high_water_bytes > 0
+
+    def _above_high_water(self, jobs: int, spooled_bytes: int) -> bool:
+        if 0 < self.high_water_jobs <= jobs:
+            return True
+        if 0 < self.high_water_bytes <= spooled_bytes:
+            return True
+        return False
+
+    def _below_low_water(self, jobs: int, spooled_bytes: int) -> bool:
+        if self.high_water_jobs > 0 and jobs > self.low_water_jobs:
+            return False
+        if self.high_water_bytes > 0 and spooled_bytes > self.low_water_bytes:
+            return False
+        return True
+
+    def is_held(self, printer_name: str) -> bool:
+        """
+        Refresh and return the hold state of a printer.
+
+        Args:
+            printer_name: Name of the printer to check
+
+        Returns:
+            True if new jobs for this printer must wait
+        """
+        if not self.enabled:
+            return False
+
+        try:
+            jobs, spooled_bytes = self.stats_provider(printer_name)
+        except Exception as e:
+            # Never block printing just because the queue cannot be read
+            logger.warning(f"⚠️ Could not read spool queue for '{printer_name}': {e}")
+            return False
+
+        held = self.held_printers.get(printer_name, False)
+        if held and self._below_low_water(jobs, spooled_bytes):
+            held = False
+            logger.info(f"▶ Resuming jobs for '{printer_name}' ({jobs} job(s), {spooled_bytes} bytes spooled)")
+        elif not held and self._above_high_water(jobs, spooled_bytes):
+            held = True
+            logger.warning(f"⏸ Holding jobs for '{printer_name}' ({jobs} job(s), {spooled_bytes} bytes spooled)")
+
+        self.held_printers[printer_name] = held
+        return held
+
+    def wait_for_capacity(self, printer_name: str):
+        """
+        Block until the printer's spool queue can accept another job.
+
+        Gives up waiting after the maximum hold time (the job is sent
+        anyway) and raises PrintCancelled if the stop event is set while
+        holding.
+
+        Args:
+            printer_name: Name of the printer the next job is sent to
+        """
+        started = self.clock()
+        while self.is_held(printer_name):
+            if 0 < self.max_hold_seconds <= self.clock() - started:
+                logger.warning(
+                    f"⚠️ Spool queue for '{printer_name}' still full after "
+                    f"{self.max_hold_seconds}s, sending job anyway"
+                )
+                return
+
+            logger.debug(f"Spool queue for '{printer_name}' is full, waiting {self.poll_interval}s")
+            if self.stop_event.wait(self.poll_interval):
+                raise PrintCancelled(f"Stopped while waiting for spool queue of '{printer_name}'")
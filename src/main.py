@@ -1,4 +1,7 @@
+import threading
+
 from src.auto_printer.arg_parser import ArgumentParser
+from src.auto_printer.disposition import PostPrintDisposition
 from src.auto_printer.file_watcher.directory_watcher import DirectoryWatcher
 from src.auto_printer.file_watcher.event_handler import DirectoryWatcherEventHandler
 from src.auto_printer.logger import setup_logger
@@ -17,12 +20,19 @@ def main():
 
 
     # Setup dependencies
-    printer = Printer(settings)
-    handler = DirectoryWatcherEventHandler(printer)
-    watcher = DirectoryWatcher(settings, handler)
+    stop_event = threading.Event()
+    printer = Printer(settings, stop_event=stop_event)
+    disposition = PostPrintDisposition(settings)
+    handler = DirectoryWatcherEventHandler(printer, disposition)
+    watcher = DirectoryWatcher(settings, handler, stop_event=stop_event)
 
     # Start watching
-    watcher.watch_directory()
+    disposition.start()
+    try:
+        watcher.watch_directory()
+    finally:
+        # Finish pending deletes/moves before exiting
+        disposition.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+"""
+Render benchmark - adaptive per-page DPI against the fixed printer DPI baseline
+
+Renders every page of the given PDFs twice, once at printer DPI and once
+at the resolution picked by AdaptiveResolution, and reports pages/sec
+and raster (spool) bytes for both. No printer is needed.
+
+Usage:
+    python -m src.tests.render_benchmark doc1.pdf doc2.pdf --printer-dpi 600
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+import pypdfium2 as pdfium
+
+from src.auto_printer.logger import logger
+from src.auto_printer.render_resolution import AdaptiveResolution, RenderStats
+from src.auto_printer.settings import WatcherSettings
+
+
+def _render(page, dpi: int):
+    bitmap = page.render(scale=dpi / 72, rotation=0)
+    try:
+        pil_image = bitmap.to_pil()
+        if pil_image.mode != 'RGB':
+            pil_image = pil_image.convert('RGB')
+        pil_image.close()
+    finally:
+        bitmap.close()
+
+
+def run_benchmark(pdf_paths: List[str], printer_dpi: int, resolution: AdaptiveResolution) -> Dict[str, RenderStats]:
+    """
+    Render all pages at fixed and adaptive DPI.
+
+    Args:
+        pdf_paths: PDF files to render
+        printer_dpi: Resolution of the fixed-DPI baseline
+        resolution: Adaptive resolution policy to compare
+
+    Returns:
+        RenderStats for the "fixed" and "adaptive" runs
+    """
+    results = {"fixed": RenderStats(), "adaptive": RenderStats()}
+
+    for pdf_path in pdf_paths:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for page_num in range(len(pdf)):
+                page = pdf[page_num]
+                try:
+                    width_pt, height_pt = page.get_size()
+
+                    started = time.perf_counter()
+                    _render(page, printer_dpi)
+                    results["fixed"].record(
+                        width_pt, height_pt, printer_dpi, printer_dpi, time.perf_counter() - started
+                    )
+
+                    # Content analysis is part of the adaptive cost
+                    started = time.perf_counter()
+                    dpi = resolution.choose_dpi(page, printer_dpi)
+                    _render(page, dpi)
+                    results["adaptive"].record(
+                        width_pt, height_pt, dpi, printer_dpi, time.perf_counter() - started
+                    )
+                finally:
+                    page.close()
+        finally:
+            pdf.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare adaptive and fixed render DPI")
+    parser.add_argument("pdfs", nargs="+", help="PDF files to render")
+    parser.add_argument("--printer-dpi", type=int, default=600, help="Fixed baseline DPI")
+    parser.add_argument("--floor-dpi", type=int, default=150, help="Lowest adaptive DPI")
+    parser.add_argument("--vector-dpi", type=int, default=300, help="DPI for text/vector pages")
+    args = parser.parse_args()
+
+    settings = WatcherSettings(
+        adaptive_dpi_enabled=True,
+        adaptive_dpi_floor=args.floor_dpi,
+        adaptive_dpi_vector=args.vector_dpi,
+    )
+    results = run_benchmark(args.pdfs, args.printer_dpi, AdaptiveResolution(settings))
+
+    fixed, adaptive = results["fixed"], results["adaptive"]
+    logger.info(f"Fixed {args.printer_dpi} DPI: {fixed.summary()}")
+    logger.info(f"Adaptive: {adaptive.summary()}")
+    if fixed.pages_per_second:
+        logger.info(f"Speedup: {adaptive.pages_per_second / fixed.pages_per_second:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
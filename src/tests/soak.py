@@ -0,0 +1,307 @@
+"""
+Soak harness - pushes synthetic print jobs through the watcher for a long time
+
+Runs the real watchdog observer, DirectoryWatcherEventHandler,
+Printer (with the render cache enabled) and post-print disposition.
+Only the Windows printing modules are replaced by the stubs in
+win32_stubs. RSS, open file descriptors and tracemalloc are sampled over
+time, and the run fails if any of them grows beyond its threshold after
+the warm-up phase.
+
+Linux only (reads /proc/self). Usage:
+    python -m src.tests.soak --jobs 5000
+"""
+
+import argparse
+import gc
+import io
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Type
+
+import pypdfium2 as pdfium
+from watchdog.observers import Observer
+
+from src.auto_printer.disposition import PostPrintDisposition
+from src.auto_printer.file_watcher.event_handler import DirectoryWatcherEventHandler
+from src.auto_printer.logger import logger
+from src.auto_printer.settings import WatcherSettings
+from src.tests.win32_stubs import FAKE_PRINTER_NAME, Win32Stubs, stubbed_printer_module
+
+MB = 1024 * 1024
+
+
+def make_synthetic_pdf(page_count: int = 2, width: float = 595) -> bytes:
+    """Return the bytes of a PDF with the given number of blank pages."""
+    pdf = pdfium.PdfDocument.new()
+    try:
+        for _ in range(page_count):
+            page = pdf.new_page(width, 842)
+            page.close()
+        buffer = io.BytesIO()
+        pdf.save(buffer)
+        return buffer.getvalue()
+    finally:
+        pdf.close()
+
+
+class CountingPrinter:
+    """Wraps the real Printer and counts printed and failed jobs."""
+
+    def __init__(self, printer):
+        self.printer = printer
+        self.printed = 0
+        self.failed = 0
+        self.condition = threading.Condition()
+
+    @property
+    def completed(self) -> int:
+        return self.printed + self.failed
+
+    def print_file(self, file_path, printer_name=None):
+        try:
+            self.printer.print_file(file_path, printer_name)
+        except Exception:
+            with self.condition:
+                self.failed += 1
+                self.condition.notify_all()
+            raise
+
+        with self.condition:
+            self.printed += 1
+            self.condition.notify_all()
+
+    def wait_for(self, count: int, timeout: float) -> bool:
+        """Wait until at least count jobs were printed or failed."""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.completed >= count, timeout=timeout)
+
+
+class ResourceSampler:
+    """Samples RSS, open file descriptors and tracemalloc usage of this process."""
+
+    def __init__(self):
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+
+    def rss_bytes(self) -> int:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * self.page_size
+
+    @staticmethod
+    def open_fds() -> int:
+        return len(os.listdir('/proc/self/fd'))
+
+    def sample(self, jobs_done: int, started_at: float) -> Dict[str, float]:
+        gc.collect()
+        traced, _ = tracemalloc.get_traced_memory()
+        return {
+            "elapsed": time.monotonic() - started_at,
+            "jobs": jobs_done,
+            "rss": self.rss_bytes(),
+            "fds": self.open_fds(),
+            "traced": traced,
+        }
+
+
+class SoakReport:
+    """Samples and leak verdict of a soak run."""
+
+    def __init__(self, samples: List[Dict[str, float]], baseline_index: int, thresholds: Dict[str, float]):
+        self.samples = samples
+        self.baseline = samples[baseline_index]
+        self.final = samples[-1]
+        self.thresholds = thresholds
+        self.growth = {
+            name: self.final[name] - self.baseline[name]
+            for name in ("rss", "fds", "traced")
+        }
+        self.top_allocations: List[str] = []
+        self.printed = 0
+        self.failed = 0
+        self.render_cache: Dict[str, float] = {}
+
+    @property
+    def leaks(self) -> List[str]:
+        """Return a description of every resource that grew past its threshold."""
+        return [
+            f"{name} grew by {self.growth[name]} (limit {self.thresholds[name]})"
+            for name in ("rss", "fds", "traced")
+            if self.growth[name] > self.thresholds[name]
+        ]
+
+    def summary(self) -> str:
+        lines = [
+            f"Jobs: {self.printed} printed, {self.failed} failed "
+            f"in {self.final['elapsed']:.1f}s",
+            f"RSS: {self.baseline['rss'] / MB:.1f} MB → {self.final['rss'] / MB:.1f} MB",
+            f"Open fds: {self.baseline['fds']} → {self.final['fds']}",
+            f"tracemalloc: {self.baseline['traced'] / MB:.2f} MB → {self.final['traced'] / MB:.2f} MB",
+            f"Render cache: {self.render_cache}",
+        ]
+        if self.leaks:
+            lines.append("LEAKS: " + "; ".join(self.leaks))
+            lines.extend(self.top_allocations)
+        return "\n".join(lines)
+
+
+class SoakHarness:
+    """Drives synthetic jobs through the watcher in waves and samples resources."""
+
+    def __init__(
+            self,
+            jobs: int = 5000,
+            wave_size: int = 100,
+            warmup_waves: int = 2,
+            pages: int = 2,
+            fail_every: int = 50,
+            max_rss_growth: int = 64 * MB,
+            max_fd_growth: int = 8,
+            max_traced_growth: int = 8 * MB,
+            wave_timeout: float = 120.0,
+            variants: int = 8,
+            dpi: int = 72,
+            render_cache_max_bytes: int = 8 * MB,
+            counting_printer_class: Type[CountingPrinter] = CountingPrinter
+    ):
+        self.jobs = jobs
+        self.wave_size = wave_size
+        self.warmup_waves = warmup_waves
+        # Distinct documents so the render cache both hits and evicts
+        self.pdf_variants = [make_synthetic_pdf(pages, 595 + variant) for variant in range(variants)]
+        self.wave_timeout = wave_timeout
+        self.fail_every = fail_every
+        self.dpi = dpi
+        self.render_cache_max_bytes = render_cache_max_bytes
+        self.counting_printer_class = counting_printer_class
+        self.printer: Optional[CountingPrinter] = None
+        self.thresholds = {
+            "rss": max_rss_growth,
+            "fds": max_fd_growth,
+            "traced": max_traced_growth,
+        }
+        self.sampler = ResourceSampler()
+
+    def _write_wave(self, watch_dir: str, first_job: int, count: int):
+        for job_num in range(first_job, first_job + count):
+            with open(os.path.join(watch_dir, f"job_{job_num:06d}.pdf"), 'wb') as f:
+                # Every document is printed twice in a row, like a reprint
+                f.write(self.pdf_variants[(job_num // 2) % len(self.pdf_variants)])
+
+    def run(self) -> SoakReport:
+        """Run the soak and return its report."""
+        app_logger = logging.getLogger("auto_printer")
+        previous_level = app_logger.level
+        app_logger.setLevel(logging.WARNING)  # Per-job INFO lines would dominate the run
+
+        stubs = Win32Stubs(dpi=self.dpi, fail_every=self.fail_every)
+        tracemalloc.start()
+        try:
+            with tempfile.TemporaryDirectory() as root, stubbed_printer_module(stubs) as printer_module:
+                watch_dir = os.path.join(root, "watch")
+                os.makedirs(watch_dir)
+                settings = WatcherSettings(
+                    watch_path=watch_dir,
+                    printer_name=FAKE_PRINTER_NAME,
+                    error_dir=os.path.join(root, "errors"),
+                    disposition_mode="delete",
+                    disposition_batch_interval=0.05,
+                    render_cache_enabled=True,
+                    render_cache_max_bytes=self.render_cache_max_bytes,
+                )
+                printer = printer_module.Printer(settings)
+                printer.pdf_retry_delay = 0.01
+                self.printer = self.counting_printer_class(printer)
+
+                disposition = PostPrintDisposition(settings)
+                handler = DirectoryWatcherEventHandler(self.printer, disposition)
+                handler.settle_seconds = 0
+
+                observer = Observer()
+                observer.schedule(handler, watch_dir, recursive=True)
+                disposition.start()
+                observer.start()
+                try:
+                    report = self._run_waves(watch_dir)
+                finally:
+                    observer.stop()
+                    observer.join()
+                    disposition.stop()
+                report.render_cache = printer.render_cache.stats()
+        finally:
+            tracemalloc.stop()
+            app_logger.setLevel(previous_level)
+
+        report.printed = self.printer.printed
+        report.failed = self.printer.failed
+        return report
+
+    def _run_waves(self, watch_dir: str) -> SoakReport:
+        started_at = time.monotonic()
+        samples = [self.sampler.sample(0, started_at)]
+        baseline_index = 0
+        baseline_snapshot = None
+
+        submitted = 0
+        wave = 0
+        while submitted < self.jobs:
+            count = min(self.wave_size, self.jobs - submitted)
+            self._write_wave(watch_dir, submitted, count)
+            submitted += count
+
+            if not self.printer.wait_for(submitted, self.wave_timeout):
+                raise RuntimeError(
+                    f"Soak stalled: {self.printer.completed}/{submitted} jobs completed "
+                    f"after {self.wave_timeout}s"
+                )
+
+            samples.append(self.sampler.sample(submitted, started_at))
+            wave += 1
+            if wave == self.warmup_waves:
+                baseline_index = len(samples) - 1
+                baseline_snapshot = tracemalloc.take_snapshot()
+
+        report = SoakReport(samples, baseline_index, self.thresholds)
+        if baseline_snapshot is not None and report.leaks:
+            stats = tracemalloc.take_snapshot().compare_to(baseline_snapshot, 'lineno')
+            report.top_allocations = [str(stat) for stat in stats[:10]]
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test the auto printer for memory and handle leaks")
+    parser.add_argument("--jobs", type=int, default=5000, help="Number of synthetic jobs")
+    parser.add_argument("--wave-size", type=int, default=100, help="Jobs written between samples")
+    parser.add_argument("--warmup-waves", type=int, default=2, help="Waves before the baseline sample")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per synthetic PDF")
+    parser.add_argument("--fail-every", type=int, default=50, help="Simulate a printer error every N jobs")
+    parser.add_argument("--dpi", type=int, default=72, help="Resolution of the simulated printer")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=64, help="Allowed RSS growth")
+    parser.add_argument("--max-fd-growth", type=int, default=8, help="Allowed open fd growth")
+    parser.add_argument("--max-traced-growth-mb", type=float, default=8, help="Allowed tracemalloc growth")
+    args = parser.parse_args()
+
+    harness = SoakHarness(
+        jobs=args.jobs,
+        wave_size=args.wave_size,
+        warmup_waves=args.warmup_waves,
+        pages=args.pages,
+        fail_every=args.fail_every,
+        dpi=args.dpi,
+        max_rss_growth=int(args.max_rss_growth_mb * MB),
+        max_fd_growth=args.max_fd_growth,
+        max_traced_growth=int(args.max_traced_growth_mb * MB),
+    )
+    report = harness.run()
+
+    for line in report.summary().splitlines():
+        logger.info(line)
+    sys.exit(1 if report.leaks else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.auto_printer.disposition import PostPrintDisposition
+from src.auto_printer.settings import WatcherSettings
+
+FIXED_NOW = datetime(2024, 5, 17, 12, 30, 0)
+
+
+class TestPostPrintDisposition(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.watch_dir = os.path.join(self.root, "watch")
+        os.makedirs(self.watch_dir)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _make_file(self, name="job.pdf"):
+        path = os.path.join(self.watch_dir, name)
+        with open(path, 'wb') as f:
+            f.write(b"%PDF-1.4\n%%EOF")
+        return path
+
+    def _disposition(self, **overrides):
+        values = dict(
+            archive_dir=os.path.join(self.root, "archive"),
+            error_dir=os.path.join(self.root, "errors"),
+            disposition_batch_interval=0.01,
+        )
+        values.update(overrides)
+        return PostPrintDisposition(WatcherSettings(**values), now=lambda: FIXED_NOW)
+
+    def _run(self, disposition, jobs):
+        disposition.start()
+        for args, kwargs in jobs:
+            disposition.submit(*args, **kwargs)
+        disposition.stop()
+
+    def test_delete_mode_removes_file(self):
+        path = self._make_file()
+        self._run(self._disposition(disposition_mode="delete"), [((path,), {})])
+
+        self.assertFalse(os.path.exists(path))
+
+    def test_keep_mode_leaves_file(self):
+        path = self._make_file()
+        self._run(self._disposition(disposition_mode="keep"), [((path,), {})])
+
+        self.assertTrue(os.path.exists(path))
+
+    def test_archive_mode_moves_to_dated_tree(self):
+        path = self._make_file()
+        self._run(self._disposition(disposition_mode="archive"), [((path,), {})])
+
+        archived = os.path.join(self.root, "archive", "2024", "05", "17", "job.pdf")
+        self.assertFalse(os.path.exists(path))
+        self.assertTrue(os.path.exists(archived))
+
+    def test_archive_does_not_overwrite_existing_file(self):
+        disposition = self._disposition(disposition_mode="archive")
+        first = self._make_file()
+        self._run(disposition, [((first,), {})])
+        second = self._make_file()
+        self._run(disposition, [((second,), {})])
+
+        day_dir = os.path.join(self.root, "archive", "2024", "05", "17")
+        self.assertEqual(sorted(os.listdir(day_dir)), ["job.pdf", "job_1.pdf"])
+
+    def test_failure_moves_to_error_dir_with_sidecar(self):
+        path = self._make_file()
+        timings = {"total_seconds": 1.5}
+        self._run(self._disposition(), [((path,), {"error": RuntimeError("paper jam"), "timings": timings})])
+
+        moved = os.path.join(self.root, "errors", "job.pdf")
+        self.assertTrue(os.path.exists(moved))
+        with open(moved + ".json", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        self.assertEqual(sidecar["error"], "paper jam")
+        self.assertEqual(sidecar["error_type"], "RuntimeError")
+        self.assertEqual(sidecar["timings"], timings)
+
+    def test_failure_without_error_dir_keeps_file(self):
+        path = self._make_file()
+        self._run(self._disposition(error_dir=None), [((path,), {"error": RuntimeError("offline")})])
+
+        self.assertTrue(os.path.exists(path))
+
+    def test_batch_is_processed_on_stop(self):
+        paths = [self._make_file(f"job{i}.pdf") for i in range(50)]
+        disposition = self._disposition(disposition_batch_size=8, disposition_batch_interval=1.0)
+        self._run(disposition, [((path,), {}) for path in paths])
+
+        self.assertEqual(os.listdir(self.watch_dir), [])
+
+    def test_submit_does_not_block_before_start(self):
+        path = self._make_file()
+        disposition = self._disposition()
+        disposition.submit(path)
+
+        # Nothing happens until the worker runs
+        self.assertTrue(os.path.exists(path))
+        disposition.start()
+        disposition.stop()
+        self.assertFalse(os.path.exists(path))
+
+    def test_is_managed_path(self):
+        disposition = self._disposition(disposition_mode="archive")
+
+        self.assertTrue(disposition.is_managed_path(os.path.join(self.root, "archive", "2024", "a.pdf")))
+        self.assertTrue(disposition.is_managed_path(os.path.join(self.root, "errors", "a.pdf")))
+        self.assertFalse(disposition.is_managed_path(os.path.join(self.watch_dir, "a.pdf")))
+
+    def test_is_managed_path_ignores_case_on_windows(self):
+        disposition = self._disposition(disposition_mode="archive")
+        upper_path = os.path.join(self.root, "ARCHIVE", "a.pdf")
+
+        with patch("os.path.normcase", side_effect=str.lower):
+            self.assertTrue(disposition.is_managed_path(upper_path))
+
+    def test_delete_mode_does_not_skip_archive_subfolder(self):
+        disposition = self._disposition(
+            watch_path=self.watch_dir,
+            archive_dir="archive",
+            disposition_mode="delete",
+        )
+
+        self.assertFalse(disposition.is_managed_path(os.path.join(self.watch_dir, "archive", "x.pdf")))
+
+    def test_relative_dirs_are_inside_watch_path(self):
+        disposition = self._disposition(
+            watch_path=self.watch_dir,
+            archive_dir="archive",
+            error_dir="errors",
+            disposition_mode="archive",
+        )
+
+        self.assertEqual(disposition.archive_dir, os.path.join(self.watch_dir, "archive"))
+        self.assertEqual(disposition.error_dir, os.path.join(self.watch_dir, "errors"))
+        self.assertTrue(disposition.is_managed_path(os.path.join(self.watch_dir, "archive", "x.pdf")))
+
+    def test_unknown_mode_raises(self):
+        with self.assertRaises(ValueError):
+            self._disposition(disposition_mode="shred")
+
+
+if __name__ == "__main__":
+    unittest.main()
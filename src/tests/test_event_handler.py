@@ -1,3 +1,5 @@
+import os
+
 import pytest
 from unittest.mock import Mock, patch
 from watchdog.events import (
@@ -12,6 +14,7 @@ from watchdog.events import (
 )
 
 from src.auto_printer.file_watcher.event_handler import DirectoryWatcherEventHandler
+from src.auto_printer.spooler import PrintCancelled
 
 
 class TestDirectoryWatcherEventHandler:
@@ -127,4 +130,83 @@ class TestDirectoryWatcherEventHandler:
         assert "✓ File created: /tmp/test.txt" in calls
         assert "✎ File modified: /tmp/test.txt" in calls
         assert "➜ File moved: /tmp/test.txt → /tmp/test_renamed.txt" in calls
-        assert "✗ File deleted: /tmp/test_renamed.txt" in calls
\ No newline at end of file
+        assert "✗ File deleted: /tmp/test_renamed.txt" in calls
+
+
+class TestDirectoryWatcherEventHandlerPrinting:
+    """Test suite for printing and post-print disposition in on_created"""
+
+    @pytest.fixture
+    def printer(self):
+        return Mock()
+
+    @pytest.fixture
+    def disposition(self):
+        disposition = Mock()
+        disposition.is_managed_path.return_value = False
+        return disposition
+
+    @pytest.fixture
+    def handler(self, printer, disposition):
+        handler = DirectoryWatcherEventHandler(printer, disposition)
+        handler.settle_seconds = 0
+        return handler
+
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        path = tmp_path / "job.pdf"
+        path.write_bytes(b"%PDF-1.4\n%%EOF")
+        return str(path)
+
+    def test_success_submits_file_without_error(self, handler, printer, disposition, pdf_path):
+        """Test that a printed file is handed to the disposition stage"""
+        with patch("src.auto_printer.file_watcher.event_handler.time.sleep") as mock_sleep:
+            handler.on_created(FileCreatedEvent(pdf_path))
+
+        printer.print_file.assert_called_once_with(pdf_path)
+        disposition.submit.assert_called_once()
+        args, kwargs = disposition.submit.call_args
+        assert args == (pdf_path,)
+        assert kwargs["error"] is None
+        assert kwargs["timings"]["print_seconds"] >= 0
+        # Only the settle delay before printing, no sleep after it
+        mock_sleep.assert_called_once_with(0)
+
+    def test_success_does_not_remove_file(self, handler, pdf_path):
+        """Test that the handler leaves deleting the file to the disposition stage"""
+        with patch("src.auto_printer.file_watcher.event_handler.os.remove") as mock_remove:
+            handler.on_created(FileCreatedEvent(pdf_path))
+
+        mock_remove.assert_not_called()
+        assert os.path.exists(pdf_path)
+
+    def test_failure_submits_file_with_error(self, handler, printer, disposition, pdf_path):
+        """Test that a failed print is handed over together with its exception"""
+        error = RuntimeError("Printer offline")
+        printer.print_file.side_effect = error
+
+        handler.on_created(FileCreatedEvent(pdf_path))
+
+        disposition.submit.assert_called_once()
+        args, kwargs = disposition.submit.call_args
+        assert args == (pdf_path,)
+        assert kwargs["error"] is error
+        assert "total_seconds" in kwargs["timings"]
+
+    def test_cancelled_job_is_left_in_place(self, handler, printer, disposition, pdf_path):
+        """Test that a job cancelled on shutdown is neither disposed nor treated as failed"""
+        printer.print_file.side_effect = PrintCancelled("Stopped while waiting for spool queue")
+
+        handler.on_created(FileCreatedEvent(pdf_path))
+
+        disposition.submit.assert_not_called()
+        assert os.path.exists(pdf_path)
+
+    def test_managed_path_is_ignored(self, handler, printer, disposition, pdf_path):
+        """Test that files appearing in the archive/error folders are not printed"""
+        disposition.is_managed_path.return_value = True
+
+        handler.on_created(FileCreatedEvent(pdf_path))
+
+        printer.print_file.assert_not_called()
+        disposition.submit.assert_not_called()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pypdfium2 as pdfium
+
+from src.auto_printer.render_cache import hash_document
+from src.auto_printer.settings import WatcherSettings
+from src.tests.soak import make_synthetic_pdf
+from src.tests.win32_stubs import FAKE_PRINTER_NAME, Win32Stubs, stubbed_printer_module
+
+
+class TestPrinterResources(unittest.TestCase):
+    """Resource handling of Printer._print_pdf_direct, run against the win32 stubs"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.pdf_path = os.path.join(self.tmp.name, "job.pdf")
+        with open(self.pdf_path, 'wb') as f:
+            f.write(make_synthetic_pdf(page_count=2))
+
+        self.stubs = Win32Stubs()
+        self.context = stubbed_printer_module(self.stubs)
+        self.printer_module = self.context.__enter__()
+        # Registered right away so the stubs are removed even if setUp fails below
+        self.addCleanup(self.context.__exit__, None, None, None)
+        self.printer = self.printer_module.Printer(WatcherSettings(printer_name=FAKE_PRINTER_NAME))
+
+    def test_prints_all_pages(self):
+        self.printer._print_pdf_direct(self.pdf_path, FAKE_PRINTER_NAME)
+
+        self.assertEqual(self.stubs.pages, 2)
+
+    def test_reprint_hits_render_cache_using_validated_content(self):
+        printer = self.printer_module.Printer(WatcherSettings(
+            printer_name=FAKE_PRINTER_NAME,
+            render_cache_enabled=True,
+        ))
+        printer.pdf_retry_delay = 0
+
+        _, doc_hash = printer._wait_for_pdf(self.pdf_path, retry_delay=0)
+        self.assertEqual(doc_hash, hash_document(self.pdf_path))
+
+        printer.print_file(self.pdf_path)
+        printer.print_file(self.pdf_path)
+        stats = printer.render_cache.stats()
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["hits"], 2)
+
+    def test_adaptive_summary_counts_cache_hits_separately(self):
+        printer = self.printer_module.Printer(WatcherSettings(
+            printer_name=FAKE_PRINTER_NAME,
+            render_cache_enabled=True,
+            adaptive_dpi_enabled=True,
+        ))
+        printer.pdf_retry_delay = 0
+
+        printer.print_file(self.pdf_path)
+        with patch.object(self.printer_module, "logger") as mock_logger:
+            printer.print_file(self.pdf_path)
+
+        summaries = [
+            call.args[0] for call in mock_logger.info.call_args_list
+            if call.args[0].startswith("Adaptive DPI")
+        ]
+        self.assertEqual(summaries, ["Adaptive DPI: 0 page(s) at 0.00 pages/s, raster 0.0 MB vs 0.0 MB "
+                                     "at fixed DPI (0% saved), 2 page(s) from render cache"])
+
+    def test_document_closed_when_rendering_raises(self):
+        original_close = pdfium.PdfDocument.close
+        with patch.object(pdfium.PdfDocument, "close", autospec=True, side_effect=original_close) as mock_close, \
+                patch.object(self.printer, "_render_page", side_effect=RuntimeError("render failed")):
+            with self.assertRaises(RuntimeError):
+                self.printer._print_pdf_direct(self.pdf_path, FAKE_PRINTER_NAME)
+
+        mock_close.assert_called_once()
+
+    def test_document_closed_when_print_job_fails(self):
+        self.stubs.fail_every = 1  # StartDoc raises
+        original_close = pdfium.PdfDocument.close
+        with patch.object(pdfium.PdfDocument, "close", autospec=True, side_effect=original_close) as mock_close:
+            with self.assertRaises(RuntimeError):
+                self.printer._print_pdf_direct(self.pdf_path, FAKE_PRINTER_NAME)
+
+        mock_close.assert_called_once()
+
+    def test_page_closed_when_rendering_raises(self):
+        original_close = pdfium.PdfPage.close
+        with patch.object(pdfium.PdfPage, "close", autospec=True, side_effect=original_close) as mock_close, \
+                patch.object(self.printer, "_render_page", side_effect=RuntimeError("render failed")):
+            with self.assertRaises(RuntimeError):
+                self.printer._print_pdf_direct(self.pdf_path, FAKE_PRINTER_NAME)
+
+        self.assertGreaterEqual(mock_close.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
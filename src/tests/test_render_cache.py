@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+
+from src.auto_printer.render_cache import RenderCache, hash_content, hash_document
+
+
+def _key(page_num, doc_hash="doc"):
+    return (doc_hash, page_num, 10, 10, 'RGB')
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def test_miss_then_hit(self):
+        cache = RenderCache(max_bytes=1000)
+
+        self.assertIsNone(cache.get(_key(0)))
+        cache.put(_key(0), b"x" * 100)
+        self.assertEqual(cache.get(_key(0)), b"x" * 100)
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_key_includes_render_size_and_mode(self):
+        cache = RenderCache(max_bytes=1000)
+        cache.put(("doc", 0, 10, 10, 'RGB'), b"a")
+
+        self.assertIsNone(cache.get(("doc", 0, 20, 20, 'RGB')))
+        self.assertIsNone(cache.get(("doc", 0, 10, 10, 'L')))
+        self.assertIsNone(cache.get(("other", 0, 10, 10, 'RGB')))
+
+    def test_evicts_least_recently_used_within_budget(self):
+        cache = RenderCache(max_bytes=300)
+        cache.put(_key(0), b"0" * 100)
+        cache.put(_key(1), b"1" * 100)
+        cache.put(_key(2), b"2" * 100)
+
+        # Touch page 0 so page 1 becomes the oldest entry
+        cache.get(_key(0))
+        cache.put(_key(3), b"3" * 100)
+
+        self.assertIsNone(cache.get(_key(1)))
+        self.assertIsNotNone(cache.get(_key(0)))
+        self.assertLessEqual(cache.current_bytes, 300)
+
+    def test_oversized_entry_is_not_kept_in_memory(self):
+        cache = RenderCache(max_bytes=10)
+        cache.put(_key(0), b"x" * 100)
+
+        self.assertEqual(cache.current_bytes, 0)
+        self.assertIsNone(cache.get(_key(0)))
+
+    def test_evicted_entries_spill_to_disk(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = RenderCache(max_bytes=100, disk_dir=disk_dir)
+            cache.put(_key(0), b"0" * 100)
+            cache.put(_key(1), b"1" * 100)
+
+            self.assertEqual(len(os.listdir(disk_dir)), 1)
+            self.assertEqual(cache.get(_key(0)), b"0" * 100)
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+
+    def test_disk_store_respects_budget(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = RenderCache(max_bytes=100, disk_dir=disk_dir, disk_max_bytes=1)
+            for page_num in range(5):
+                cache.put(_key(page_num), os.urandom(100))
+
+            self.assertLessEqual(len(os.listdir(disk_dir)), 1)
+
+    def test_disk_store_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = RenderCache(max_bytes=100, disk_dir=disk_dir)
+            pages = {page_num: os.urandom(100) for page_num in range(4)}
+            for page_num in range(4):
+                cache.put(_key(page_num), pages[page_num])
+            # Pages 0-2 are on disk, page 3 in memory
+            entry_size = max(cache.disk_entries.values())
+            cache.disk_max_bytes = 3 * entry_size
+
+            # Reuse spilled page 0, then spill another page
+            self.assertEqual(cache.get(_key(0)), pages[0])
+            cache.put(_key(4), os.urandom(100))
+
+            self.assertIsNone(cache._load(_key(1)))
+            self.assertEqual(cache._load(_key(0)), pages[0])
+            self.assertLessEqual(cache.disk_bytes, cache.disk_max_bytes)
+
+    def test_disk_store_is_reloaded_on_restart(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = RenderCache(max_bytes=100, disk_dir=disk_dir)
+            cache.put(_key(0), b"0" * 100)
+            cache.put(_key(1), b"1" * 100)
+
+            restarted = RenderCache(max_bytes=100, disk_dir=disk_dir)
+            self.assertEqual(restarted.disk_bytes, cache.disk_bytes)
+            self.assertEqual(restarted.get(_key(0)), b"0" * 100)
+
+    def test_hash_document_depends_on_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = os.path.join(tmp, "a.pdf")
+            second = os.path.join(tmp, "b.pdf")
+            for path, content in ((first, b"%PDF-1"), (second, b"%PDF-1")):
+                with open(path, 'wb') as f:
+                    f.write(content)
+
+            self.assertEqual(hash_document(first), hash_document(second))
+
+            with open(second, 'ab') as f:
+                f.write(b"changed")
+            self.assertNotEqual(hash_document(first), hash_document(second))
+
+    def test_hash_content_matches_hash_document(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.pdf")
+            with open(path, 'wb') as f:
+                f.write(b"%PDF-1 content")
+
+            self.assertEqual(hash_content(b"%PDF-1 content"), hash_document(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
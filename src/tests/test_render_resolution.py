@@ -0,0 +1,213 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+from PIL import Image
+
+from src.auto_printer.render_resolution import AdaptiveResolution, RenderStats, analyze_page
+from src.auto_printer.settings import WatcherSettings
+from src.tests.render_benchmark import run_benchmark
+
+
+def _add_image(pdf, page, pixels, size_pt):
+    """Place a pixels x pixels image on the page, drawn size_pt points wide."""
+    image = pdfium.PdfImage.new(pdf)
+    bitmap = pdfium.PdfBitmap.from_pil(Image.new('RGB', (pixels, pixels), 'gray'))
+    image.set_bitmap(bitmap)
+    image.set_matrix(pdfium.PdfMatrix().scale(size_pt, size_pt).translate(36, 36))
+    page.insert_obj(image)
+
+
+def _add_form(pdf, page, source_pdf, scale):
+    """Place page 0 of source_pdf on the page as a Form XObject scaled by scale."""
+    xobject = pdfium_c.FPDF_NewXObjectFromPage(pdf.raw, source_pdf.raw, 0)
+    form = pdfium.PdfObject(pdfium_c.FPDF_NewFormObjectFromXObject(xobject), pdf=pdf)
+    form.set_matrix(pdfium.PdfMatrix().scale(scale, scale))
+    page.insert_obj(form)
+    pdfium_c.FPDF_CloseXObject(xobject)
+
+
+def _add_rect(pdf, page):
+    rect = pdfium_c.FPDFPageObj_CreateNewRect(72, 72, 200, 100)
+    pdfium_c.FPDFPath_SetDrawMode(rect, pdfium_c.FPDF_FILLMODE_ALTERNATE, False)
+    page.insert_obj(pdfium.PdfObject(rect, pdf=pdf))
+
+
+def _add_square_annotation(page):
+    annot = pdfium_c.FPDFPage_CreateAnnot(page.raw, pdfium_c.FPDF_ANNOT_SQUARE)
+    pdfium_c.FPDFAnnot_SetRect(annot, pdfium_c.FS_RECTF(72, 172, 272, 72))
+    pdfium_c.FPDFAnnot_SetColor(annot, pdfium_c.FPDFANNOT_COLORTYPE_Color, 255, 0, 0, 255)
+    pdfium_c.FPDFPage_CloseAnnot(annot)
+
+
+class TestAdaptiveResolution(unittest.TestCase):
+
+    def setUp(self):
+        self.pdf = pdfium.PdfDocument.new()
+        self.page = self.pdf.new_page(595, 842)
+        self.resolution = AdaptiveResolution(WatcherSettings(
+            adaptive_dpi_enabled=True,
+            adaptive_dpi_floor=150,
+            adaptive_dpi_vector=300,
+        ))
+
+    def tearDown(self):
+        self.page.close()
+        self.pdf.close()
+
+    def test_disabled_uses_printer_dpi(self):
+        _add_image(self.pdf, self.page, 100, 144)
+        self.page.gen_content()
+        resolution = AdaptiveResolution(WatcherSettings())
+
+        self.assertEqual(resolution.choose_dpi(self.page, 600), 600)
+
+    def test_empty_page_uses_floor(self):
+        self.assertEqual(self.resolution.choose_dpi(self.page, 600), 150)
+
+    def test_vector_page_uses_vector_dpi(self):
+        _add_rect(self.pdf, self.page)
+        self.page.gen_content()
+
+        content = analyze_page(self.page)
+        self.assertTrue(content.has_vector)
+        self.assertEqual(content.image_count, 0)
+        self.assertEqual(self.resolution.choose_dpi(self.page, 600), 300)
+
+    def test_annotation_only_page_uses_vector_dpi(self):
+        _add_square_annotation(self.page)
+
+        content = analyze_page(self.page)
+        self.assertEqual(content.annotation_count, 1)
+        self.assertTrue(content.has_vector)
+        self.assertEqual(self.resolution.choose_dpi(self.page, 600), 300)
+
+    def test_scanned_page_uses_image_dpi(self):
+        # 400 px over 144 pt (2 inches) is 200 DPI
+        _add_image(self.pdf, self.page, 400, 144)
+        self.page.gen_content()
+
+        content = analyze_page(self.page)
+        self.assertFalse(content.has_vector)
+        self.assertAlmostEqual(content.max_image_dpi, 200)
+        self.assertEqual(self.resolution.choose_dpi(self.page, 600), 200)
+
+    def test_low_resolution_image_is_clamped_to_floor(self):
+        _add_image(self.pdf, self.page, 100, 144)
+        self.page.gen_content()
+
+        self.assertEqual(self.resolution.choose_dpi(self.page, 600), 150)
+
+    def test_high_resolution_image_is_clamped_to_printer_dpi(self):
+        _add_image(self.pdf, self.page, 2400, 144)
+        self.page.gen_content()
+
+        self.assertEqual(self.resolution.choose_dpi(self.page, 600), 600)
+
+    def test_mixed_page_uses_highest_requirement(self):
+        _add_rect(self.pdf, self.page)
+        _add_image(self.pdf, self.page, 1000, 144)  # 500 DPI
+        self.page.gen_content()
+
+        self.assertEqual(self.resolution.choose_dpi(self.page, 600), 500)
+
+    def test_image_inside_scaled_form_uses_page_space_size(self):
+        # 400 px over 144 pt is 200 DPI, halved by the form to 72 pt: 400 DPI
+        source = pdfium.PdfDocument.new()
+        source_page = source.new_page(595, 842)
+        _add_image(source, source_page, 400, 144)
+        source_page.gen_content()
+        source_page.close()
+
+        _add_form(self.pdf, self.page, source, 0.5)
+        self.page.gen_content()
+        source.close()
+
+        content = analyze_page(self.page)
+        self.assertEqual(content.image_count, 1)
+        self.assertAlmostEqual(content.max_image_dpi, 400)
+        self.assertEqual(self.resolution.choose_dpi(self.page, 600), 400)
+
+    def test_rotated_image_uses_page_space_size(self):
+        image = pdfium.PdfImage.new(self.pdf)
+        image.set_bitmap(pdfium.PdfBitmap.from_pil(Image.new('RGB', (400, 400), 'gray')))
+        image.set_matrix(pdfium.PdfMatrix().scale(144, 144).rotate(45).translate(200, 200))
+        self.page.insert_obj(image)
+        self.page.gen_content()
+
+        # The bounding box grows when rotated, the image itself does not
+        self.assertAlmostEqual(analyze_page(self.page).max_image_dpi, 200, places=3)
+
+    def test_too_deeply_nested_form_uses_printer_dpi(self):
+        source = pdfium.PdfDocument.new()
+        source_page = source.new_page(595, 842)
+        _add_image(source, source_page, 100, 144)
+        source_page.gen_content()
+        source_page.close()
+
+        _add_form(self.pdf, self.page, source, 1.0)
+        self.page.gen_content()
+        source.close()
+
+        with patch("src.auto_printer.render_resolution.MAX_FORM_DEPTH", 1):
+            content = analyze_page(self.page)
+            self.assertTrue(content.has_unresolved_forms)
+            self.assertEqual(self.resolution.choose_dpi(self.page, 600), 600)
+
+    def test_floor_above_printer_dpi(self):
+        self.assertEqual(self.resolution.choose_dpi(self.page, 100), 100)
+
+
+class TestRenderStats(unittest.TestCase):
+
+    def test_compares_against_fixed_dpi(self):
+        stats = RenderStats()
+        # One inch square page
+        stats.record(72, 72, 300, 600, 0.5)
+        stats.record(72, 72, 300, 600, 0.5)
+
+        self.assertEqual(stats.pages, 2)
+        self.assertEqual(stats.pages_per_second, 2.0)
+        self.assertEqual(stats.raster_bytes, 2 * 300 * 300 * 3)
+        self.assertEqual(stats.fixed_raster_bytes, 2 * 600 * 600 * 3)
+        self.assertAlmostEqual(stats.saved_ratio, 0.75)
+
+    def test_cached_pages_are_reported_separately(self):
+        stats = RenderStats()
+        stats.record(72, 72, 300, 600, 0.5)
+        stats.record_cached()
+
+        self.assertEqual(stats.pages, 1)
+        self.assertEqual(stats.cached_pages, 1)
+        self.assertEqual(stats.pages_per_second, 2.0)
+        self.assertEqual(stats.raster_bytes, 300 * 300 * 3)
+        self.assertIn("1 page(s) from render cache", stats.summary())
+
+
+class TestRenderBenchmark(unittest.TestCase):
+
+    def test_benchmark_reports_both_runs(self):
+        pdf = pdfium.PdfDocument.new()
+        page = pdf.new_page(200, 200)
+        _add_rect(pdf, page)
+        page.gen_content()
+        page.close()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "vector.pdf")
+            pdf.save(path)
+            pdf.close()
+
+            resolution = AdaptiveResolution(WatcherSettings(adaptive_dpi_enabled=True))
+            results = run_benchmark([path], 600, resolution)
+
+        self.assertEqual(results["fixed"].pages, 1)
+        self.assertEqual(results["adaptive"].pages, 1)
+        self.assertLess(results["adaptive"].raster_bytes, results["fixed"].raster_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
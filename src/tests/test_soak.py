@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+from src.tests.soak import MB, CountingPrinter, SoakHarness
+
+# Short by default; set AUTO_PRINTER_SOAK_JOBS for a real soak
+SOAK_JOBS = int(os.environ.get("AUTO_PRINTER_SOAK_JOBS", "400"))
+
+
+class LeakyPrinter(CountingPrinter):
+    """Printer wrapper that keeps a reference to every job it prints."""
+
+    def __init__(self, printer):
+        super().__init__(printer)
+        self.kept = []
+
+    def print_file(self, file_path, printer_name=None):
+        self.kept.append(bytearray(64 * 1024))
+        super().print_file(file_path, printer_name)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "soak harness reads /proc/self")
+class TestSoak(unittest.TestCase):
+
+    def test_no_leaks_over_many_jobs(self):
+        harness = SoakHarness(jobs=SOAK_JOBS, wave_size=50, fail_every=25)
+        report = harness.run()
+
+        self.assertEqual(report.printed + report.failed, SOAK_JOBS)
+        self.assertGreater(report.failed, 0)
+        # The real Printer ran with its render cache
+        self.assertGreater(report.render_cache["hits"], 0)
+        self.assertGreater(report.render_cache["misses"], 0)
+        self.assertEqual(report.leaks, [], report.summary())
+
+    def test_detects_growing_memory(self):
+        harness = SoakHarness(
+            jobs=200,
+            wave_size=50,
+            warmup_waves=1,
+            fail_every=0,
+            max_traced_growth=1 * MB,
+            counting_printer_class=LeakyPrinter,
+        )
+        report = harness.run()
+
+        self.assertTrue(any(leak.startswith("traced") for leak in report.leaks))
+        self.assertTrue(report.top_allocations)
+
+
+if __name__ == "__main__":
+    unittest.main()
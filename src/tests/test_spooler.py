@@ -0,0 +1,156 @@
+import unittest
+
+from src.auto_printer.settings import WatcherSettings
+from src.auto_printer.spooler import PrintCancelled, SpoolerBackpressure
+
+
+class FakeSpoolQueue:
+    """Stand-in for the Windows spooler that replays queue snapshots."""
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.calls = []
+
+    def __call__(self, printer_name):
+        self.calls.append(printer_name)
+        if len(self.snapshots) > 1:
+            return self.snapshots.pop(0)
+        return self.snapshots[0]
+
+
+class FakeStopEvent:
+    """Stand-in for threading.Event that records waits and never blocks."""
+
+    def __init__(self, set_after=None):
+        self.set_after = set_after  # Report the event as set on this wait call
+        self.waits = []
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        return self.set_after is not None and len(self.waits) >= self.set_after
+
+
+class FakeClock:
+    """Clock that advances by a fixed step on every read."""
+
+    def __init__(self, step):
+        self.step = step
+        self.now = 0.0
+
+    def __call__(self):
+        value = self.now
+        self.now += self.step
+        return value
+
+
+class TestSpoolerBackpressure(unittest.TestCase):
+
+    def _settings(self, **overrides):
+        values = dict(
+            spool_high_water_jobs=4,
+            spool_low_water_jobs=1,
+            spool_high_water_bytes=1000,
+            spool_low_water_bytes=200,
+            spool_poll_interval=0.5,
+            spool_max_hold_seconds=0,
+        )
+        values.update(overrides)
+        return WatcherSettings(**values)
+
+    def test_does_not_wait_below_high_water(self):
+        queue = FakeSpoolQueue([(3, 999)])
+        stop_event = FakeStopEvent()
+        backpressure = SpoolerBackpressure(self._settings(), queue, stop_event=stop_event)
+
+        backpressure.wait_for_capacity("PrinterA")
+
+        self.assertEqual(stop_event.waits, [])
+        self.assertEqual(queue.calls, ["PrinterA"])
+
+    def test_holds_until_low_water_on_job_count(self):
+        queue = FakeSpoolQueue([(4, 0), (3, 0), (2, 0), (1, 0)])
+        stop_event = FakeStopEvent()
+        backpressure = SpoolerBackpressure(self._settings(), queue, stop_event=stop_event)
+
+        backpressure.wait_for_capacity("PrinterA")
+
+        self.assertEqual(stop_event.waits, [0.5, 0.5, 0.5])
+        self.assertFalse(backpressure.held_printers["PrinterA"])
+
+    def test_holds_until_low_water_on_spooled_bytes(self):
+        queue = FakeSpoolQueue([(1, 5000), (1, 800), (1, 200)])
+        stop_event = FakeStopEvent()
+        backpressure = SpoolerBackpressure(self._settings(), queue, stop_event=stop_event)
+
+        backpressure.wait_for_capacity("PrinterA")
+
+        self.assertEqual(len(stop_event.waits), 2)
+
+    def test_hysteresis_between_marks(self):
+        queue = FakeSpoolQueue([(4, 0), (2, 0)])
+        backpressure = SpoolerBackpressure(self._settings(), queue, stop_event=FakeStopEvent())
+
+        self.assertTrue(backpressure.is_held("PrinterA"))
+        # Still above the low-water mark, so the hold stays in place
+        self.assertTrue(backpressure.is_held("PrinterA"))
+
+    def test_printers_are_tracked_separately(self):
+        queue = FakeSpoolQueue([(10, 0), (0, 0)])
+        backpressure = SpoolerBackpressure(self._settings(), queue, stop_event=FakeStopEvent())
+
+        self.assertTrue(backpressure.is_held("PrinterA"))
+        self.assertFalse(backpressure.is_held("PrinterB"))
+
+    def test_zero_high_water_marks_disable_backpressure(self):
+        queue = FakeSpoolQueue([(100, 10 ** 9)])
+        settings = self._settings(spool_high_water_jobs=0, spool_high_water_bytes=0)
+        backpressure = SpoolerBackpressure(settings, queue, stop_event=FakeStopEvent())
+
+        self.assertFalse(backpressure.is_held("PrinterA"))
+        self.assertEqual(queue.calls, [])
+
+    def test_unreadable_queue_does_not_block(self):
+        def failing_provider(printer_name):
+            raise OSError("spooler unavailable")
+
+        backpressure = SpoolerBackpressure(self._settings(), failing_provider, stop_event=FakeStopEvent())
+
+        self.assertFalse(backpressure.is_held("PrinterA"))
+
+    def test_stop_event_releases_waiting_job(self):
+        queue = FakeSpoolQueue([(10, 0)])
+        stop_event = FakeStopEvent(set_after=3)
+        backpressure = SpoolerBackpressure(self._settings(), queue, stop_event=stop_event)
+
+        with self.assertRaises(PrintCancelled):
+            backpressure.wait_for_capacity("PrinterA")
+        self.assertEqual(len(stop_event.waits), 3)
+
+    def test_max_hold_time_sends_job_anyway(self):
+        queue = FakeSpoolQueue([(10, 0)])
+        stop_event = FakeStopEvent()
+        backpressure = SpoolerBackpressure(
+            self._settings(spool_max_hold_seconds=5),
+            queue,
+            stop_event=stop_event,
+            clock=FakeClock(step=1.0),
+        )
+
+        backpressure.wait_for_capacity("PrinterA")
+
+        self.assertTrue(0 < len(stop_event.waits) < 10)
+
+    def test_low_water_above_high_water_raises(self):
+        with self.assertRaises(ValueError):
+            SpoolerBackpressure(self._settings(spool_low_water_jobs=5), FakeSpoolQueue([(0, 0)]))
+        with self.assertRaises(ValueError):
+            SpoolerBackpressure(self._settings(spool_low_water_bytes=2000), FakeSpoolQueue([(0, 0)]))
+
+    def test_disabled_mark_skips_validation(self):
+        settings = self._settings(spool_high_water_jobs=0, spool_low_water_jobs=5)
+
+        SpoolerBackpressure(settings, FakeSpoolQueue([(0, 0)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Stand-ins for the Windows printing modules
+
+Lets the real Printer run on Linux: win32print, win32ui, win32con and
+PIL's ImageWin are replaced by fakes whose device context accepts pages
+and drops them. Everything else (pypdfium2 rendering, PIL conversion,
+render cache, backpressure) is the production code.
+"""
+
+import importlib
+import sys
+import types
+from contextlib import contextmanager
+from unittest.mock import patch
+
+FAKE_PRINTER_NAME = "Soak Printer"
+
+
+class FakeDC:
+    """Printer device context that accepts pages and drops them."""
+
+    def __init__(self, printer_stubs: "Win32Stubs"):
+        self.stubs = printer_stubs
+
+    def CreatePrinterDC(self, printer_name):
+        pass
+
+    def GetDeviceCaps(self, index):
+        caps = {
+            FakeWin32Con.LOGPIXELSX: self.stubs.dpi,
+            FakeWin32Con.LOGPIXELSY: self.stubs.dpi,
+            FakeWin32Con.HORZRES: int(8.27 * self.stubs.dpi),  # A4
+            FakeWin32Con.VERTRES: int(11.69 * self.stubs.dpi),
+        }
+        return caps[index]
+
+    def StartDoc(self, doc_name):
+        self.stubs.documents += 1
+        if self.stubs.fail_every and self.stubs.documents % self.stubs.fail_every == 0:
+            raise RuntimeError("Simulated printer failure")
+
+    def StartPage(self):
+        pass
+
+    def EndPage(self):
+        self.stubs.pages += 1
+
+    def EndDoc(self):
+        pass
+
+    def DeleteDC(self):
+        pass
+
+    def GetHandleOutput(self):
+        return 0
+
+
+class FakeDib:
+    """ImageWin.Dib replacement; drawing is a no-op."""
+
+    def __init__(self, image):
+        self.size = image.size
+
+    def draw(self, handle, dst):
+        pass
+
+
+class FakeWin32Con:
+    LOGPIXELSX = 88
+    LOGPIXELSY = 90
+    HORZRES = 8
+    VERTRES = 10
+
+
+class Win32Stubs:
+    """Fake win32 modules sharing one simulated printer."""
+
+    def __init__(self, dpi: int = 72, fail_every: int = 0):
+        self.dpi = dpi
+        self.fail_every = fail_every  # Fail every Nth document in StartDoc (0 disables)
+        self.documents = 0
+        self.pages = 0
+
+        self.win32con = types.ModuleType("win32con")
+        for name in ("LOGPIXELSX", "LOGPIXELSY", "HORZRES", "VERTRES"):
+            setattr(self.win32con, name, getattr(FakeWin32Con, name))
+
+        self.win32print = types.ModuleType("win32print")
+        self.win32print.GetDefaultPrinter = lambda: FAKE_PRINTER_NAME
+        self.win32print.EnumPrinters = lambda level: [(0, "", FAKE_PRINTER_NAME, "")]
+        self.win32print.OpenPrinter = lambda printer_name: object()
+        self.win32print.ClosePrinter = lambda handle: None
+        self.win32print.GetPrinter = lambda handle, level: {"Status": 0}
+        self.win32print.EnumJobs = lambda handle, first, count, level: ()
+
+        self.win32ui = types.ModuleType("win32ui")
+        self.win32ui.CreateDC = lambda: FakeDC(self)
+
+        self.image_win = types.SimpleNamespace(Dib=FakeDib)
+
+
+@contextmanager
+def stubbed_printer_module(stubs: Win32Stubs):
+    """
+    Import src.auto_printer.printer with the Windows modules replaced.
+
+    Yields:
+        The printer module, whose Printer class uses the stubs
+    """
+    modules = {
+        "win32con": stubs.win32con,
+        "win32print": stubs.win32print,
+        "win32ui": stubs.win32ui,
+    }
+    # Only swap these entries; restoring all of sys.modules would unload
+    # pypdfium2 and friends imported in between
+    saved = {name: sys.modules.get(name) for name in modules}
+    printer_was_imported = "src.auto_printer.printer" in sys.modules
+    sys.modules.update(modules)
+    try:
+        printer_module = importlib.import_module("src.auto_printer.printer")
+        # The module may have been imported earlier with the real modules
+        with patch.multiple(printer_module, ImageWin=stubs.image_win, **modules):
+            yield printer_module
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        if not printer_was_imported:
+            sys.modules.pop("src.auto_printer.printer", None)